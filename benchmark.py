@@ -0,0 +1,238 @@
+"""Benchmarks draft generation and xml2rfc rendering of the generated draft.
+
+Each stage is timed and its peak memory recorded at several listing sizes.
+Each stage runs several times and the fastest run is kept.  Generation stages run in this process and report the tracemalloc peak.
+xml2rfc stages run as child processes and report their peak RSS.  The
+serialize stage writes block fragments rendered beforehand, so it does not
+overlap the rows stage.
+
+Run the benchmarks and store them as the baseline:
+    python benchmark.py --save-baseline
+
+Run them again and fail if any stage got slower or used more memory than the
+baseline:
+    python benchmark.py
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from html import escape
+
+import xml2rfc
+
+
+GENERATOR_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generate-draft.py')
+BASELINE_FILE = 'benchmark-baseline.json'
+REPEAT = 5
+# Differences below these are noise, whatever the fraction of the baseline
+TIME_FLOOR = 0.005
+MEMORY_FLOOR = 64 * 1024
+SIZES = ['35', '256', 'full']
+GENERATE_STAGES = ['lookup', 'rows', 'serialize']
+RENDER_STAGES = ['text', 'html', 'pdf']
+STAGES = GENERATE_STAGES + RENDER_STAGES
+
+
+def load_generator():
+    """Returns generate-draft.py imported as a module."""
+    spec = importlib.util.spec_from_file_location('generate_draft', GENERATOR_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def block_ranges(generator, limit):
+    """Yields the first and last codepoint listed for each block in the draft."""
+    data = generator.unicode_data()
+    for groups in (data.scripts_groups, data.symbols_groups):
+        for block_name in generator.block_names(groups):
+            if block_name in data.blocks:
+                start, end = data.blocks[block_name]
+                char_ints = range(start, end + 1)[:limit]
+                yield char_ints.start, char_ints.stop - 1
+
+
+def measure(repeat, function, *args):
+    """Returns (seconds, peak bytes) of calling function in this process.
+
+    seconds is the fastest of repeat calls.  The peak is taken from one more
+    call, tracemalloc slows down the timed calls otherwise.
+    """
+    seconds = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def measure_process(repeat, command):
+    """Returns the lowest (seconds, peak RSS bytes) of running command repeat times."""
+    runs = [run_process(command) for _ in range(repeat)]
+    return min(seconds for seconds, _ in runs), min(peak for _, peak in runs)
+
+
+def run_process(command):
+    """Returns (seconds, peak RSS bytes) of running command as a child process."""
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=stderr)
+        # wait4() reports the resource usage of this child only
+        _, status, rusage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(f'{" ".join(command)} failed:\n{stderr.read().decode("utf-8", "replace")}')
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return seconds, rusage.ru_maxrss * scale
+
+
+def run_lookup(generator, limit):
+    for start, end in block_ranges(generator, limit):
+        generator.SCRIPT_TABLE.classify_range(start, end)
+
+
+def run_rows(generator, limit):
+    for groups in (generator.unicode_data().scripts_groups, generator.unicode_data().symbols_groups):
+        for block_name in generator.block_names(groups):
+            for _ in generator.block_lines(block_name, limit):
+                pass
+
+
+def render_fragments(generator, limit):
+    """Returns the rendered fragment of each block in the draft, in draft order."""
+    names = [name for _, groups in generator.draft_parts() for name in generator.block_names(groups)]
+    return [generator.render_block(name, limit) for name in names]
+
+
+def run_serialize(generator, fragments, path):
+    with open(path, 'w', encoding='utf-8') as file:
+        out = generator.DraftWriter(file)
+        out.write(generator.DRAFT_HEAD.format(doc_name=generator.DOC_NAME, title=escape(generator.TITLE)))
+        block_fragments = ([fragment] for fragment in fragments)
+        for intro, groups in generator.draft_parts():
+            generator.write_groups(out, intro, groups, block_fragments)
+        out.write(generator.DRAFT_TAIL)
+        out.flush()
+
+
+def run_benchmarks(sizes, stages, workdir, repeat=REPEAT):
+    generator = load_generator()
+    results = {}
+    for size in sizes:
+        limit = None if size == 'full' else int(size)
+        draft = os.path.join(workdir, f'draft-{size}.xml')
+        for stage in stages:
+            if stage == 'lookup':
+                seconds, peak = measure(repeat, run_lookup, generator, limit)
+            elif stage == 'rows':
+                seconds, peak = measure(repeat, run_rows, generator, limit)
+            elif stage == 'serialize':
+                fragments = render_fragments(generator, limit)
+                seconds, peak = measure(repeat, run_serialize, generator, fragments, draft)
+            else:
+                if not os.path.exists(draft):
+                    with open(draft, 'w', encoding='utf-8') as file:
+                        generator.write_draft(file, limit)
+                output = os.path.join(workdir, f'draft-{size}.{stage}')
+                seconds, peak = measure_process(repeat, ['xml2rfc', f'--{stage}', '--quiet', '--out', output, draft])
+            results[f'{stage}/{size}'] = {'seconds': seconds, 'peak_bytes': peak}
+            print(f'{stage}/{size}: {seconds:.3f} s, {format_bytes(peak)}', file=sys.stderr)
+    return results
+
+
+def format_bytes(size):
+    if size < 1024 * 1024:
+        return f'{size / 1024:.1f} KiB'
+    return f'{size / 1024 / 1024:.1f} MiB'
+
+
+def compare(results, baseline, tolerance, memory_tolerance, time_floor=TIME_FLOOR, memory_floor=MEMORY_FLOOR):
+    """Returns messages for results slower or using more memory than baseline.
+
+    Time may exceed the baseline by the fraction tolerance or by time_floor
+    seconds, whichever is more.  Peak memory may exceed it by the fraction
+    memory_tolerance or by memory_floor bytes, whichever is more.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        seconds = baseline[name]['seconds']
+        if result['seconds'] > max(seconds * (1 + tolerance), seconds + time_floor):
+            regressions.append(f'{name}: {result["seconds"]:.3f} s, baseline {seconds:.3f} s')
+        peak = baseline[name]['peak_bytes']
+        if result['peak_bytes'] > max(peak * (1 + memory_tolerance), peak + memory_floor):
+            regressions.append(f'{name}: {format_bytes(result["peak_bytes"])}, baseline {format_bytes(peak)}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark draft generation and xml2rfc rendering.')
+    parser.add_argument('--sizes', default=','.join(SIZES),
+                        help=f'characters listed per block, comma separated (default: {",".join(SIZES)})')
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f'stages to run, comma separated (default: {",".join(STAGES)})')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help=f'baseline file (default: {BASELINE_FILE})')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown over the baseline as a fraction (default: 0.25)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.1,
+                        help='allowed peak memory growth over the baseline as a fraction (default: 0.1)')
+    parser.add_argument('--repeat', type=int, default=REPEAT,
+                        help=f'runs per stage, the fastest is kept (default: {REPEAT})')
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+    stages = args.stages.split(',')
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f'unknown stages: {", ".join(sorted(unknown))}')
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run_benchmarks(args.sizes.split(','), stages, workdir, args.repeat)
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'xml2rfc': xml2rfc.__version__,
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        return 0
+
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+    except FileNotFoundError:
+        print(f'No baseline in {args.baseline}, run with --save-baseline first', file=sys.stderr)
+        return 0
+    regressions = compare(results, baseline, args.tolerance, args.memory_tolerance)
+    for regression in regressions:
+        print(f'Regression in {regression}', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Reports codepoints whose xml2rfc scripts or fonts differ between two versions.
+
+Each side is either a script table file written by script_table.py under some
+xml2rfc version, or a unicode_data.json file written by ingest_unicode.py with
+the Scripts.txt ranges of some Unicode version.
+
+Usage:
+    python diff_scripts.py old/script_table.bin script_table.bin
+    python diff_scripts.py old/unicode_data.json unicode_data.json --xml
+"""
+import argparse
+import sys
+from html import escape
+
+import script_table
+from ingest_unicode import DATA_FILE, UnicodeData
+
+
+def script_table_spans(path):
+    """Returns (start, end, scripts, fonts) spans of a script table file."""
+    return script_table.ScriptTable(path).classify_range(0, script_table.MAX_CODEPOINT)
+
+
+def unicode_data_spans(path):
+    """Returns (start, end, scripts, fonts) spans of the Scripts.txt ranges in a unicode data file."""
+    scripts = UnicodeData(path).scripts
+    if not scripts:
+        raise ValueError(f'{path} has no Scripts.txt ranges, rebuild it with ingest_unicode.py')
+    spans = []
+    next_start = 0
+    for start, end, script in scripts:
+        if start > next_start:
+            spans.append((next_start, start - 1, ('Unknown',), ()))
+        spans.append((start, end, (script,), tuple(script_table.fonts_for_scripts([script]))))
+        next_start = end + 1
+    if next_start <= script_table.MAX_CODEPOINT:
+        spans.append((next_start, script_table.MAX_CODEPOINT, ('Unknown',), ()))
+    return spans
+
+
+def is_unicode_data(path):
+    return path.endswith('.json')
+
+
+def load_spans(path):
+    if is_unicode_data(path):
+        return unicode_data_spans(path)
+    return script_table_spans(path)
+
+
+def diff_spans(old, new):
+    """Returns (start, end, old_scripts, new_scripts, old_fonts, new_fonts) where old and new differ.
+
+    Both span lists must cover the whole codepoint range in order.  They are
+    walked together, so the cost depends on the number of spans only.
+    """
+    changes = []
+    i = j = 0
+    start = 0
+    while i < len(old) and j < len(new):
+        _, old_end, old_scripts, old_fonts = old[i]
+        _, new_end, new_scripts, new_fonts = new[j]
+        end = min(old_end, new_end)
+        if old_scripts != new_scripts or old_fonts != new_fonts:
+            change = (old_scripts, new_scripts, old_fonts, new_fonts)
+            if changes and changes[-1][1] + 1 == start and changes[-1][2:] == change:
+                changes[-1] = (changes[-1][0], end, *change)
+            else:
+                changes.append((start, end, *change))
+        start = end + 1
+        if old_end == end:
+            i += 1
+        if new_end == end:
+            j += 1
+    return changes
+
+
+def changes_by_block(changes, blocks):
+    """Returns {block name: changes clipped to the block}, for blocks with changes.
+
+    Changes outside every block are listed under 'No block', last.
+    """
+    ranges = sorted((char_range, block_name) for block_name, char_range in blocks.items())
+    next_start = 0
+    gaps = []
+    for (block_start, block_end), _ in ranges:
+        if block_start > next_start:
+            gaps.append(((next_start, block_start - 1), 'No block'))
+        next_start = max(next_start, block_end + 1)
+    if next_start <= script_table.MAX_CODEPOINT:
+        gaps.append(((next_start, script_table.MAX_CODEPOINT), 'No block'))
+
+    by_block = {}
+    for (block_start, block_end), block_name in ranges + gaps:
+        for start, end, *change in changes:
+            if start <= block_end and end >= block_start:
+                by_block.setdefault(block_name, []).append((max(start, block_start), min(end, block_end), *change))
+    return by_block
+
+
+def format_range(start, end):
+    return f'U+{start:04X}' if start == end else f'U+{start:04X}..U+{end:04X}'
+
+
+def text_report(by_block):
+    lines = []
+    for block_name, changes in by_block.items():
+        lines.append(block_name)
+        for start, end, old_scripts, new_scripts, old_fonts, new_fonts in changes:
+            line = f'  {format_range(start, end)}: {", ".join(old_scripts)} -> {", ".join(new_scripts)}'
+            if old_fonts != new_fonts:
+                line += f'; fonts {",".join(old_fonts) or "none"} -> {",".join(new_fonts) or "none"}'
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def xml_report(by_block, old_name, new_name):
+    lines = [
+        '<section>',
+        f'<name>Changes between {escape(old_name)} and {escape(new_name)}</name>',
+    ]
+    if not by_block:
+        lines.append('<t>No codepoint changed scripts or fonts.</t>')
+    for block_name, changes in by_block.items():
+        lines.append(f'''<table>
+  <name>{escape(block_name)} Changes</name>
+  <thead>
+    <tr>
+      <th>Characters</th>
+      <th>Old scripts</th>
+      <th>New scripts</th>
+      <th>Old fonts</th>
+      <th>New fonts</th>
+    </tr>
+  </thead>
+<tbody>''')
+        for start, end, old_scripts, new_scripts, old_fonts, new_fonts in changes:
+            lines.append(f'<tr>\n<td>{format_range(start, end)}</td>\n<td>{", ".join(old_scripts)}</td>\n'
+                         f'<td>{", ".join(new_scripts)}</td>\n<td>{",".join(old_fonts)}</td>\n'
+                         f'<td>{",".join(new_fonts)}</td>\n</tr>')
+        lines.append('</tbody>')
+        lines.append('</table>')
+    lines.append('</section>')
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report script and font changes between two versions.')
+    parser.add_argument('old', help='old script table or unicode data file')
+    parser.add_argument('new', help='new script table or unicode data file')
+    parser.add_argument('--data', default=DATA_FILE, help=f'unicode data file with the blocks (default: {DATA_FILE})')
+    parser.add_argument('--xml', action='store_true', help='write the report as a draft section')
+    args = parser.parse_args()
+
+    if is_unicode_data(args.old) != is_unicode_data(args.new):
+        parser.error('old and new must both be script tables or both be unicode data files')
+    try:
+        changes = diff_spans(load_spans(args.old), load_spans(args.new))
+    except ValueError as e:
+        parser.error(str(e))
+    by_block = changes_by_block(changes, UnicodeData(args.data).blocks)
+
+    if args.xml:
+        print(xml_report(by_block, args.old, args.new))
+    elif by_block:
+        print(text_report(by_block))
+    sys.exit(1 if changes else 0)
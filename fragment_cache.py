@@ -0,0 +1,63 @@
+"""On-disk cache of rendered draft section fragments.
+
+Fragments are stored one per file, named by the SHA-256 digest of their key.
+Reading a fragment updates its modification time, and evict() removes the
+least recently used fragments until the cache fits in its size cap.
+"""
+import hashlib
+import os
+import tempfile
+
+
+class FragmentCache:
+
+    def __init__(self, directory, max_size=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(*parts):
+        """Returns a cache key for parts, which must have stable reprs."""
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.xml')
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        """Returns the fragment stored under key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                fragment = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return fragment
+
+    def put(self, key, fragment):
+        """Stores fragment under key."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(fragment)
+        os.replace(tmp_path, self._path(key))
+
+    def evict(self):
+        """Removes least recently used fragments until the cache fits max_size."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.xml'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -1,15 +1,33 @@
+import argparse
+import cProfile
+import csv
+import hashlib
+import inspect
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import cache
 from html import escape
+from time import perf_counter
 
-from lxml import etree
-from xml2rfc.uniscripts import which_scripts
-from xml2rfc.util.fonts import get_noto_serif_family_for_script
+import script_table
+from fragment_cache import FragmentCache
+from ingest_unicode import UnicodeData
+from xml_chars import XML_CHAR_RANGES, is_xml_char, xml_char_ranges
 
 
+DOC_NAME = 'draft-rathnayake-xml2rfc-unicode-01'
+TITLE = 'Experiment with Unicode characters in xml2rfc'
+
 DRAFT_HEAD = '''<?xml version="1.0" encoding="utf-8"?>
 
-<rfc ipr="trust200902" docName="draft-rathnayake-xml2rfc-unicode-01" category="exp" submissionType="independent" tocInclude="true" sortRefs="true" symRefs="true">
+<rfc ipr="trust200902" docName="{doc_name}" category="exp" submissionType="independent" tocInclude="true" sortRefs="true" symRefs="true">
   <front>
-    <title abbrev="xml2rfc-unicode">Experiment with Unicode characters in xml2rfc</title>
+    <title abbrev="xml2rfc-unicode">{title}</title>
     <author initials="K." surname="Nanayakkara Rathnayake" asciiFullname="Kesara Nanayakkara Rathnayake" fullname="&#3482;&#3545;&#3523;&#3515; &#3505;&#3535;&#3505;&#3535;&#3514;&#3482;&#3530;&#3482;&#3535;&#3515; &#3515;&#3501;&#3530;&#3505;&#3535;&#3514;&#3482;">
       <organization>IETF Administration LLC</organization>
       <address>
@@ -107,27 +125,115 @@ DRAFT_TAIL = '''
   </back>
 </rfc>'''
 
-SCRIPTS_GROUPS = {'European Scripts': [{'Armenian': []}, {'Carian': []}, {'Caucasian Albanian': []}, {'Cypriot Syllabary': []}, {'Cypro-Minoan': []}, {'Cyrillic': []}, {'Cyrillic Supplement': []}, {'Cyrillic Extended-A': []}, {'Cyrillic Extended-B': []}, {'Cyrillic Extended-C': []}, {'Cyrillic Extended-D': []}, {'Elbasan': []}, {'Georgian': []}, {'Georgian Extended': []}, {'Georgian Supplement': []}, {'Glagolitic': []}, {'Glagolitic Supplement': []}, {'Gothic': []}, {'Greek and Coptic': []}, {'Greek Extended': []}, {'Ancient Greek Numbers': []}, {'Basic Latin': []}, {'Latin-1 Supplement': []}, {'Latin Extended-A': []}, {'Latin Extended-B': []}, {'Latin Extended-C': []}, {'Latin Extended-D': []}, {'Latin Extended-E': []}, {'Latin Extended-F': []}, {'Latin Extended-G': []}, {'Latin Extended Additional': []}, {'IPA Extensions': []}, {'Phonetic Extensions': []}, {'Phonetic Extensions Supplement': []}, {'Linear A': []}, {'Linear B': []}, {'Linear B Syllabary': []}, {'Linear B Ideograms': []}, {'Aegean Numbers': []}, {'Lycian': []}, {'Lydian': []}, {'Ogham': []}, {'Old Hungarian': []}, {'Old Italic': []}, {'Old Permic': []}, {'Phaistos Disc': []}, {'Runic': []}, {'Shavian': []}, {'Todhri': []}, {'Vithkuqi': []}], 'Modifier Letters': [{'Modifier Tone Letters': []}, {'Spacing Modifier Letters': []}, {'Superscripts and Subscripts': []}], 'Combining Marks': [{'Combining Diacritical Marks': []}, {'Combining Diacritical Marks Extended': []}, {'Combining Diacritical Marks Supplement': []}, {'Combining Diacritical Marks for Symbols': []}, {'Combining Half Marks': []}], 'Miscellaneous': [{'Alphabetic Presentation Forms': []}, {'Halfwidth and Fullwidth Forms': []}], 'African Scripts': [{'Adlam': []}, {'Bamum': []}, {'Bamum Supplement': []}, {'Bassa Vah': []}, {'Coptic': []}, {'Coptic Epact Numbers': []}, {'Egyptian Hieroglyphs': []}, {'Egyptian Hieroglyph Format Controls': []}, {'Egyptian Hieroglyphs Extended-A': []}, {'Ethiopic': []}, {'Ethiopic Supplement': []}, {'Ethiopic Extended': []}, {'Ethiopic Extended-A': []}, {'Ethiopic Extended-B': []}, {'Garay': []}, {'Medefaidrin': []}, {'Mende Kikakui': []}, {'Meroitic': []}, {'Meroitic Cursive': []}, {'Meroitic Hieroglyphs': []}, {'NKo': []}, {'Osmanya': []}, {'Tifinagh': []}, {'Vai': []}], 'Middle Eastern Scripts': [{'Anatolian Hieroglyphs': []}, {'Arabic': []}, {'Arabic Supplement': []}, {'Arabic Extended-A': []}, {'Arabic Extended-B': []}, {'Arabic Extended-C': []}, {'Arabic Presentation Forms-A': []}, {'Arabic Presentation Forms-B': []}, {'Imperial Aramaic': []}, {'Avestan': []}, {'Chorasmian': []}, {'Cuneiform': []}, {'Cuneiform Numbers and Punctuation': []}, {'Early Dynastic Cuneiform': []}, {'Old Persian': []}, {'Ugaritic': []}, {'Elymaic': []}, {'Hatran': []}, {'Hebrew': ['Hebrew Presentation Forms']}, {'Mandaic': []}, {'Nabataean': []}, {'Old North Arabian': []}, {'Old South Arabian': []}, {'Inscriptional Pahlavi': []}, {'Psalter Pahlavi': []}, {'Palmyrene': []}, {'Inscriptional Parthian': []}, {'Phoenician': []}, {'Samaritan': []}, {'Syriac': ['Syriac Supplement']}, {'Yezidi': []}], 'Central Asian Scripts': [{'Manichaean': []}, {'Marchen': []}, {'Mongolian': []}, {'Mongolian Supplement': []}, {'Old Sogdian': []}, {'Old Turkic': []}, {'Old Uyghur': []}, {'Phags-pa': []}, {'Sogdian': []}, {'Soyombo': []}, {'Tibetan': []}, {'Zanabazar Square': []}], 'South Asian Scripts': [{'Ahom': []}, {'Bengali': []}, {'Bhaiksuki': []}, {'Brahmi': []}, {'Chakma': []}, {'Devanagari': []}, {'Devanagari Extended': []}, {'Devanagari Extended-A': []}, {'Dives Akuru': []}, {'Dogra': []}, {'Grantha': []}, {'Gujarati': []}, {'Gunjala Gondi': []}, {'Gurmukhi': []}, {'Gurung Khema': []}, {'Kaithi': []}, {'Kannada': []}, {'Kharoshthi': []}, {'Khojki': []}, {'Kirat Rai': []}, {'Khudawadi': []}, {'Lepcha': []}, {'Limbu': []}, {'Mahajani': []}, {'Malayalam': []}, {'Masaram Gondi': []}, {'Meetei Mayek': []}, {'Meetei Mayek Extensions': []}, {'Modi': []}, {'Mro': []}, {'Multani': []}, {'Nag Mundari': []}, {'Nandinagari': []}, {'Newa': []}, {'Ol Chiki': []}, {'Ol Onal': []}, {'Oriya': []}, {'Saurashtra': []}, {'Sharada': []}, {'Siddham': []}, {'Sinhala': []}, {'Sinhala Archaic Numbers': []}, {'Sora Sompeng': []}, {'Sunuwar': []}, {'Syloti Nagri': []}, {'Takri': []}, {'Tamil': []}, {'Tamil Supplement': []}, {'Telugu': []}, {'Thaana': []}, {'Tirhuta': []}, {'Toto': []}, {'Tulu-Tigalari': []}, {'Vedic Extensions': []}, {'Wancho': []}, {'Warang Citi': []}], 'Southeast Asian Scripts': [{'Cham': []}, {'Hanifi Rohingya': []}, {'Kayah Li': []}, {'Khmer': []}, {'Khmer Symbols': []}, {'Lao': []}, {'Myanmar': []}, {'Myanmar Extended-A': []}, {'Myanmar Extended-B': []}, {'Myanmar Extended-C': []}, {'New Tai Lue': []}, {'Nyiakeng Puachue Hmong': []}, {'Pahawh Hmong': []}, {'Pau Cin Hau': []}, {'Tai Le': []}, {'Tai Tham': []}, {'Tai Viet': []}, {'Tangsa': []}, {'Thai': []}], 'Indonesian & Philippine Scripts': [{'Balinese': []}, {'Batak': []}, {'Buginese': []}, {'Buhid': []}, {'Hanunoo': []}, {'Javanese': []}, {'Kawi': []}, {'Makasar': []}, {'Rejang': []}, {'Sundanese': []}, {'Sundanese Supplement': []}, {'Tagalog': []}, {'Tagbanwa': []}], 'East Asian Scripts': [{'Bopomofo': []}, {'Bopomofo Extended': []}, {'CJK Unified Ideographs (Han) (43MB)': []}, {'CJK  Extension A (10MB)': []}, {'CJK Extension B (45MB)': []}, {'CJK Extension C': []}, {'CJK Unified Ideographs Extension D': []}, {'CJK Extension E': []}, {'CJK Extension F': []}, {'CJK Extension G': []}, {'CJK Extension H': []}, {'CJK Extension I': []}, {'CJK Compatibility Ideographs': []}, {'CJK Compatibility Ideographs Supplement': []}, {'Kangxi Radicals': []}, {'CJK Radicals Supplement': []}, {'CJK Strokes': []}, {'Ideographic Description Characters': []}, {'Hangul Jamo': []}, {'Hangul Jamo Extended-A': []}, {'Hangul Jamo Extended-B': []}, {'Hangul Compatibility Jamo': []}, {'Hangul Syllables': []}, {'Hiragana': []}, {'Kana Extended-A': []}, {'Kana Extended-B': []}, {'Kana Supplement': []}, {'Small Kana Extension': []}, {'Kanbun': []}, {'Katakana': []}, {'Katakana Phonetic Extensions': []}, {'Khitan Small Script': []}, {'Lisu': []}, {'Lisu Supplement': []}, {'Miao': []}, {'Nushu': []}, {'Tangut': []}, {'Tangut Components': []}, {'Tangut Supplement': []}, {'Yi': []}, {'Yi Syllables': []}, {'Yi Radicals': []}]}
 
-SYMBOLS_GROUPS = {'Notational Systems': [{'Braille Patterns': []}, {'Musical Symbols': []}, {'Ancient Greek Musical Notation': []}, {'Byzantine Musical Symbols': []}, {'Znamenny Musical Notation': []}, {'Duployan': []}, {'Shorthand Format Controls': []}, {'Sutton SignWriting': []}], 'Punctuation': [{'General Punctuation': []}, {'Supplemental Punctuation': []}, {'CJK Symbols and Punctuation': []}, {'Ideographic Symbols and Punctuation': []}, {'CJK Compatibility Forms': []}, {'Halfwidth and Fullwidth Forms': []}, {'Small Form Variants': []}, {'Vertical Forms': []}], 'Alphanumeric Symbols': [{'Letterlike Symbols': []}, {'Mathematical Alphanumeric Symbols': []}, {'Arabic Mathematical Alphabetic Symbols': []}, {'Enclosed Alphanumerics': []}, {'Enclosed Alphanumeric Supplement': []}, {'Enclosed CJK Letters and Months': []}, {'Enclosed Ideographic Supplement': []}, {'CJK Compatibility': []}], 'Technical Symbols': [{'Control Pictures': []}, {'Miscellaneous Technical': []}, {'Optical Character Recognition': []}], 'Numbers & Digits': [{'Common Indic Number Forms': []}, {'Coptic Epact Numbers': []}, {'Counting Rod Numerals': []}, {'Cuneiform Numbers and Punctuation': []}, {'Indic Siyaq Numbers': []}, {'Kaktovik Numerals': []}, {'Mayan Numerals': []}, {'Number Forms': []}, {'Ottoman Siyaq Numbers': []}, {'Rumi Numeral Symbols': []}, {'Sinhala Archaic Numbers': []}, {'Superscripts and Subscripts': []}], 'Mathematical Symbols': [{'Arrows': []}, {'Supplemental Arrows-A': []}, {'Supplemental Arrows-B': []}, {'Supplemental Arrows-C': []}, {'Miscellaneous Symbols and Arrows': []}, {'Mathematical Alphanumeric Symbols': []}, {'Arabic Mathematical Alphabetic Symbols': []}, {'Letterlike Symbols': []}, {'Mathematical Operators': []}, {'Supplemental Mathematical Operators': []}, {'Miscellaneous Mathematical Symbols-A': []}, {'Miscellaneous Mathematical Symbols-B': []}, {'Geometric Shapes': []}, {'Box Drawing': []}, {'Block Elements': []}, {'Geometric Shapes Extended': []}], 'Emoji & Pictographs': [{'Dingbats': []}, {'Ornamental Dingbats': []}, {'Emoticons': []}, {'Miscellaneous Symbols': []}, {'Miscellaneous Symbols and Pictographs': []}, {'Supplemental Symbols and Pictographs': []}, {'Symbols and Pictographs Extended-A': []}, {'Transport and Map Symbols': []}], 'Other Symbols': [{'Alchemical Symbols': []}, {'Ancient Symbols': []}, {'Currency Symbols': []}, {'Game Symbols': []}, {'Chess Symbols': []}, {'Domino Tiles': []}, {'Mahjong Tiles': []}, {'Playing Cards': []}, {'Miscellaneous Symbols and Arrows': []}, {'Symbols for Legacy Computing': []}, {'Symbols for Legacy Computing Supplement': []}, {'Yijing Symbols': []}, {'Yijing Hexagram Symbols': []}, {'Tai Xuan Jing Symbols': []}], 'Specials': [{'Specials': []}, {'Tags': []}, {'Variation Selectors': []}, {'Variation Selectors Supplement': []}], 'Private Use': [{'Private Use Area': []}, {'Supplementary Private Use Area-A': []}, {'Supplementary Private Use Area-B': []}], 'Surrogates': [{'High Surrogates': []}, {'Low Surrogates': []}]}
+SCRIPTS_INTRO = '''
+<section>
+  <name>Scripts</name>
+  <t>This section covers Unicode scripts as defined in <xref target="charts" />.</t>'''
+
+SYMBOLS_INTRO = '''
+<section>
+  <name>Symbols and Punctuation</name>
+  <t>This section covers Unicode symbols and punctuation as defined in <xref target="charts" />.</t>'''
+
+SAMPLE_SIZE = 35
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.draft-cache')
+
+# Blocks rendered ahead of the writer per worker process, enough to keep the
+# workers busy without holding the whole draft in memory
+RENDER_AHEAD = 2
+
+RENDER_FORMATS = {'text': 'txt', 'html': 'html', 'pdf': 'pdf'}
+
+BLOCK_STATS = [
+    'block',
+    'cached',
+    'codepoints',
+    'invalid_xml',
+    'script_lookup_seconds',
+    'font_lookup_seconds',
+    'bytes',
+    'wall_seconds',
+]
+
+
+class DraftWriter:
+    """Writes draft lines to a file in chunks instead of one print() per line."""
+
+    def __init__(self, file, chunk_size=1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self._lines = []
+        self._size = 0
+
+    def write(self, line):
+        self._lines.append(line)
+        self._lines.append('\n')
+        self._size += len(line) + 1
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        self.file.write(''.join(self._lines))
+        self._lines = []
+        self._size = 0
+
+
+@cache
+def unicode_data():
+    """Returns the block and chart data, loaded on first use."""
+    return UnicodeData()
+
 
-BLOCKS = {'Basic Latin': (0, 127), 'Latin-1 Supplement': (128, 255), 'Latin Extended-A': (256, 383), 'Latin Extended-B': (384, 591), 'IPA Extensions': (592, 687), 'Spacing Modifier Letters': (688, 767), 'Combining Diacritical Marks': (768, 879), 'Greek and Coptic': (880, 1023), 'Cyrillic': (1024, 1279), 'Cyrillic Supplement': (1280, 1327), 'Armenian': (1328, 1423), 'Hebrew': (1424, 1535), 'Arabic': (1536, 1791), 'Syriac': (1792, 1871), 'Arabic Supplement': (1872, 1919), 'Thaana': (1920, 1983), 'NKo': (1984, 2047), 'Samaritan': (2048, 2111), 'Mandaic': (2112, 2143), 'Syriac Supplement': (2144, 2159), 'Arabic Extended-B': (2160, 2207), 'Arabic Extended-A': (2208, 2303), 'Devanagari': (2304, 2431), 'Bengali': (2432, 2559), 'Gurmukhi': (2560, 2687), 'Gujarati': (2688, 2815), 'Oriya': (2816, 2943), 'Tamil': (2944, 3071), 'Telugu': (3072, 3199), 'Kannada': (3200, 3327), 'Malayalam': (3328, 3455), 'Sinhala': (3456, 3583), 'Thai': (3584, 3711), 'Lao': (3712, 3839), 'Tibetan': (3840, 4095), 'Myanmar': (4096, 4255), 'Georgian': (4256, 4351), 'Hangul Jamo': (4352, 4607), 'Ethiopic': (4608, 4991), 'Ethiopic Supplement': (4992, 5023), 'Cherokee': (5024, 5119), 'Unified Canadian Aboriginal Syllabics': (5120, 5759), 'Ogham': (5760, 5791), 'Runic': (5792, 5887), 'Tagalog': (5888, 5919), 'Hanunoo': (5920, 5951), 'Buhid': (5952, 5983), 'Tagbanwa': (5984, 6015), 'Khmer': (6016, 6143), 'Mongolian': (6144, 6319), 'Unified Canadian Aboriginal Syllabics Extended': (6320, 6399), 'Limbu': (6400, 6479), 'Tai Le': (6480, 6527), 'New Tai Lue': (6528, 6623), 'Khmer Symbols': (6624, 6655), 'Buginese': (6656, 6687), 'Tai Tham': (6688, 6831), 'Combining Diacritical Marks Extended': (6832, 6911), 'Balinese': (6912, 7039), 'Sundanese': (7040, 7103), 'Batak': (7104, 7167), 'Lepcha': (7168, 7247), 'Ol Chiki': (7248, 7295), 'Cyrillic Extended-C': (7296, 7311), 'Georgian Extended': (7312, 7359), 'Sundanese Supplement': (7360, 7375), 'Vedic Extensions': (7376, 7423), 'Phonetic Extensions': (7424, 7551), 'Phonetic Extensions Supplement': (7552, 7615), 'Combining Diacritical Marks Supplement': (7616, 7679), 'Latin Extended Additional': (7680, 7935), 'Greek Extended': (7936, 8191), 'General Punctuation': (8192, 8303), 'Superscripts and Subscripts': (8304, 8351), 'Currency Symbols': (8352, 8399), 'Combining Diacritical Marks for Symbols': (8400, 8447), 'Letterlike Symbols': (8448, 8527), 'Number Forms': (8528, 8591), 'Arrows': (8592, 8703), 'Mathematical Operators': (8704, 8959), 'Miscellaneous Technical': (8960, 9215), 'Control Pictures': (9216, 9279), 'Optical Character Recognition': (9280, 9311), 'Enclosed Alphanumerics': (9312, 9471), 'Box Drawing': (9472, 9599), 'Block Elements': (9600, 9631), 'Geometric Shapes': (9632, 9727), 'Miscellaneous Symbols': (9728, 9983), 'Dingbats': (9984, 10175), 'Miscellaneous Mathematical Symbols-A': (10176, 10223), 'Supplemental Arrows-A': (10224, 10239), 'Braille Patterns': (10240, 10495), 'Supplemental Arrows-B': (10496, 10623), 'Miscellaneous Mathematical Symbols-B': (10624, 10751), 'Supplemental Mathematical Operators': (10752, 11007), 'Miscellaneous Symbols and Arrows': (11008, 11263), 'Glagolitic': (11264, 11359), 'Latin Extended-C': (11360, 11391), 'Coptic': (11392, 11519), 'Georgian Supplement': (11520, 11567), 'Tifinagh': (11568, 11647), 'Ethiopic Extended': (11648, 11743), 'Cyrillic Extended-A': (11744, 11775), 'Supplemental Punctuation': (11776, 11903), 'CJK Radicals Supplement': (11904, 12031), 'Kangxi Radicals': (12032, 12255), 'Ideographic Description Characters': (12272, 12287), 'CJK Symbols and Punctuation': (12288, 12351), 'Hiragana': (12352, 12447), 'Katakana': (12448, 12543), 'Bopomofo': (12544, 12591), 'Hangul Compatibility Jamo': (12592, 12687), 'Kanbun': (12688, 12703), 'Bopomofo Extended': (12704, 12735), 'CJK Strokes': (12736, 12783), 'Katakana Phonetic Extensions': (12784, 12799), 'Enclosed CJK Letters and Months': (12800, 13055), 'CJK Compatibility': (13056, 13311), 'CJK Unified Ideographs Extension A': (13312, 19903), 'Yijing Hexagram Symbols': (19904, 19967), 'CJK Unified Ideographs': (19968, 40959), 'Yi Syllables': (40960, 42127), 'Yi Radicals': (42128, 42191), 'Lisu': (42192, 42239), 'Vai': (42240, 42559), 'Cyrillic Extended-B': (42560, 42655), 'Bamum': (42656, 42751), 'Modifier Tone Letters': (42752, 42783), 'Latin Extended-D': (42784, 43007), 'Syloti Nagri': (43008, 43055), 'Common Indic Number Forms': (43056, 43071), 'Phags-pa': (43072, 43135), 'Saurashtra': (43136, 43231), 'Devanagari Extended': (43232, 43263), 'Kayah Li': (43264, 43311), 'Rejang': (43312, 43359), 'Hangul Jamo Extended-A': (43360, 43391), 'Javanese': (43392, 43487), 'Myanmar Extended-B': (43488, 43519), 'Cham': (43520, 43615), 'Myanmar Extended-A': (43616, 43647), 'Tai Viet': (43648, 43743), 'Meetei Mayek Extensions': (43744, 43775), 'Ethiopic Extended-A': (43776, 43823), 'Latin Extended-E': (43824, 43887), 'Cherokee Supplement': (43888, 43967), 'Meetei Mayek': (43968, 44031), 'Hangul Syllables': (44032, 55215), 'Hangul Jamo Extended-B': (55216, 55295), 'High Surrogates': (55296, 56191), 'High Private Use Surrogates': (56192, 56319), 'Low Surrogates': (56320, 57343), 'Private Use Area': (57344, 63743), 'CJK Compatibility Ideographs': (63744, 64255), 'Alphabetic Presentation Forms': (64256, 64335), 'Arabic Presentation Forms-A': (64336, 65023), 'Variation Selectors': (65024, 65039), 'Vertical Forms': (65040, 65055), 'Combining Half Marks': (65056, 65071), 'CJK Compatibility Forms': (65072, 65103), 'Small Form Variants': (65104, 65135), 'Arabic Presentation Forms-B': (65136, 65279), 'Halfwidth and Fullwidth Forms': (65280, 65519), 'Specials': (65520, 65535), 'Linear B Syllabary': (65536, 65663), 'Linear B Ideograms': (65664, 65791), 'Aegean Numbers': (65792, 65855), 'Ancient Greek Numbers': (65856, 65935), 'Ancient Symbols': (65936, 65999), 'Phaistos Disc': (66000, 66047), 'Lycian': (66176, 66207), 'Carian': (66208, 66271), 'Coptic Epact Numbers': (66272, 66303), 'Old Italic': (66304, 66351), 'Gothic': (66352, 66383), 'Old Permic': (66384, 66431), 'Ugaritic': (66432, 66463), 'Old Persian': (66464, 66527), 'Deseret': (66560, 66639), 'Shavian': (66640, 66687), 'Osmanya': (66688, 66735), 'Osage': (66736, 66815), 'Elbasan': (66816, 66863), 'Caucasian Albanian': (66864, 66927), 'Vithkuqi': (66928, 67007), 'Todhri': (67008, 67071), 'Linear A': (67072, 67455), 'Latin Extended-F': (67456, 67519), 'Cypriot Syllabary': (67584, 67647), 'Imperial Aramaic': (67648, 67679), 'Palmyrene': (67680, 67711), 'Nabataean': (67712, 67759), 'Hatran': (67808, 67839), 'Phoenician': (67840, 67871), 'Lydian': (67872, 67903), 'Meroitic Hieroglyphs': (67968, 67999), 'Meroitic Cursive': (68000, 68095), 'Kharoshthi': (68096, 68191), 'Old South Arabian': (68192, 68223), 'Old North Arabian': (68224, 68255), 'Manichaean': (68288, 68351), 'Avestan': (68352, 68415), 'Inscriptional Parthian': (68416, 68447), 'Inscriptional Pahlavi': (68448, 68479), 'Psalter Pahlavi': (68480, 68527), 'Old Turkic': (68608, 68687), 'Old Hungarian': (68736, 68863), 'Hanifi Rohingya': (68864, 68927), 'Garay': (68928, 69007), 'Rumi Numeral Symbols': (69216, 69247), 'Yezidi': (69248, 69311), 'Arabic Extended-C': (69312, 69375), 'Old Sogdian': (69376, 69423), 'Sogdian': (69424, 69487), 'Old Uyghur': (69488, 69551), 'Chorasmian': (69552, 69599), 'Elymaic': (69600, 69631), 'Brahmi': (69632, 69759), 'Kaithi': (69760, 69839), 'Sora Sompeng': (69840, 69887), 'Chakma': (69888, 69967), 'Mahajani': (69968, 70015), 'Sharada': (70016, 70111), 'Sinhala Archaic Numbers': (70112, 70143), 'Khojki': (70144, 70223), 'Multani': (70272, 70319), 'Khudawadi': (70320, 70399), 'Grantha': (70400, 70527), 'Tulu-Tigalari': (70528, 70655), 'Newa': (70656, 70783), 'Tirhuta': (70784, 70879), 'Siddham': (71040, 71167), 'Modi': (71168, 71263), 'Mongolian Supplement': (71264, 71295), 'Takri': (71296, 71375), 'Myanmar Extended-C': (71376, 71423), 'Ahom': (71424, 71503), 'Dogra': (71680, 71759), 'Warang Citi': (71840, 71935), 'Dives Akuru': (71936, 72031), 'Nandinagari': (72096, 72191), 'Zanabazar Square': (72192, 72271), 'Soyombo': (72272, 72367), 'Unified Canadian Aboriginal Syllabics Extended-A': (72368, 72383), 'Pau Cin Hau': (72384, 72447), 'Devanagari Extended-A': (72448, 72543), 'Sunuwar': (72640, 72703), 'Bhaiksuki': (72704, 72815), 'Marchen': (72816, 72895), 'Masaram Gondi': (72960, 73055), 'Gunjala Gondi': (73056, 73135), 'Makasar': (73440, 73471), 'Kawi': (73472, 73567), 'Lisu Supplement': (73648, 73663), 'Tamil Supplement': (73664, 73727), 'Cuneiform': (73728, 74751), 'Cuneiform Numbers and Punctuation': (74752, 74879), 'Early Dynastic Cuneiform': (74880, 75087), 'Cypro-Minoan': (77712, 77823), 'Egyptian Hieroglyphs': (77824, 78895), 'Egyptian Hieroglyph Format Controls': (78896, 78943), 'Egyptian Hieroglyphs Extended-A': (78944, 82943), 'Anatolian Hieroglyphs': (82944, 83583), 'Gurung Khema': (90368, 90431), 'Bamum Supplement': (92160, 92735), 'Mro': (92736, 92783), 'Tangsa': (92784, 92879), 'Bassa Vah': (92880, 92927), 'Pahawh Hmong': (92928, 93071), 'Kirat Rai': (93504, 93567), 'Medefaidrin': (93760, 93855), 'Miao': (93952, 94111), 'Ideographic Symbols and Punctuation': (94176, 94207), 'Tangut': (94208, 100351), 'Tangut Components': (100352, 101119), 'Khitan Small Script': (101120, 101631), 'Tangut Supplement': (101632, 101759), 'Kana Extended-B': (110576, 110591), 'Kana Supplement': (110592, 110847), 'Kana Extended-A': (110848, 110895), 'Small Kana Extension': (110896, 110959), 'Nushu': (110960, 111359), 'Duployan': (113664, 113823), 'Shorthand Format Controls': (113824, 113839), 'Symbols for Legacy Computing Supplement': (117760, 118463), 'Znamenny Musical Notation': (118528, 118735), 'Byzantine Musical Symbols': (118784, 119039), 'Musical Symbols': (119040, 119295), 'Ancient Greek Musical Notation': (119296, 119375), 'Kaktovik Numerals': (119488, 119519), 'Mayan Numerals': (119520, 119551), 'Tai Xuan Jing Symbols': (119552, 119647), 'Counting Rod Numerals': (119648, 119679), 'Mathematical Alphanumeric Symbols': (119808, 120831), 'Sutton SignWriting': (120832, 121519), 'Latin Extended-G': (122624, 122879), 'Glagolitic Supplement': (122880, 122927), 'Cyrillic Extended-D': (122928, 123023), 'Nyiakeng Puachue Hmong': (123136, 123215), 'Toto': (123536, 123583), 'Wancho': (123584, 123647), 'Nag Mundari': (124112, 124159), 'Ol Onal': (124368, 124415), 'Ethiopic Extended-B': (124896, 124927), 'Mende Kikakui': (124928, 125151), 'Adlam': (125184, 125279), 'Indic Siyaq Numbers': (126064, 126143), 'Ottoman Siyaq Numbers': (126208, 126287), 'Arabic Mathematical Alphabetic Symbols': (126464, 126719), 'Mahjong Tiles': (126976, 127023), 'Domino Tiles': (127024, 127135), 'Playing Cards': (127136, 127231), 'Enclosed Alphanumeric Supplement': (127232, 127487), 'Enclosed Ideographic Supplement': (127488, 127743), 'Miscellaneous Symbols and Pictographs': (127744, 128511), 'Emoticons': (128512, 128591), 'Ornamental Dingbats': (128592, 128639), 'Transport and Map Symbols': (128640, 128767), 'Alchemical Symbols': (128768, 128895), 'Geometric Shapes Extended': (128896, 129023), 'Supplemental Arrows-C': (129024, 129279), 'Supplemental Symbols and Pictographs': (129280, 129535), 'Chess Symbols': (129536, 129647), 'Symbols and Pictographs Extended-A': (129648, 129791), 'Symbols for Legacy Computing': (129792, 130047), 'CJK Unified Ideographs Extension B': (131072, 173791), 'CJK Unified Ideographs Extension C': (173824, 177983), 'CJK Unified Ideographs Extension D': (177984, 178207), 'CJK Unified Ideographs Extension E': (178208, 183983), 'CJK Unified Ideographs Extension F': (183984, 191471), 'CJK Unified Ideographs Extension I': (191472, 192095), 'CJK Compatibility Ideographs Supplement': (194560, 195103), 'CJK Unified Ideographs Extension G': (196608, 201551), 'CJK Unified Ideographs Extension H': (201552, 205743), 'Tags': (917504, 917631), 'Variation Selectors Supplement': (917760, 917999), 'Supplementary Private Use Area-A': (983040, 1048575), 'Supplementary Private Use Area-B': (1048576, 1114111)}
+def last_listed(char_range, limit):
+    """Returns the last codepoint of char_range listed in the draft."""
+    if limit is None:
+        return char_range[1]
+    return min(char_range[1], char_range[0] + limit - 1)
 
 
-def print_block(block_name, close=True):
+def block_counts(block_name, limit=SAMPLE_SIZE):
+    """Returns (codepoints, invalid_xml), the characters listed for block_name and how many are not XML."""
+    char_range = unicode_data().blocks.get(block_name)
+    if char_range is None:
+        return 0, 0
+    last_char = last_listed(char_range, limit)
+    codepoints = last_char - char_range[0] + 1
+    return codepoints, codepoints - sum(end - start + 1 for start, end in xml_char_ranges(char_range[0], last_char))
+
+
+def block_lines(block_name, limit=SAMPLE_SIZE, stats=None):
+    """Yields draft lines for block_name, without the closing </section>.
+
+    Only the first limit characters are listed, or all of them if limit is None.
+    If stats is a dict, character counts and lookup times are recorded in it.
+    """
     try:
-        char_range = BLOCKS[block_name]
+        char_range = unicode_data().blocks[block_name]
     except KeyError:
-        print(f'<section><name>{block_name}</name>')
-        if close:
-            print('</section>')
+        yield f'<section><name>{block_name}</name>'
         return
 
-    print('<section>')
-    print(f'<name>{block_name}</name>')
-    print(f'<t>Unicode character range: U+{hex(char_range[0])[2:].upper().zfill(4)}..U+{hex(char_range[1])[2:].upper().zfill(4)}</t>')
-    print(f'<t><eref target="https://www.unicode.org/charts/PDF/U{hex(char_range[0])[2:].upper().zfill(4)}.pdf">Unicode {block_name} character list</eref></t>')
-    print(f'''
+    yield '<section>'
+    yield f'<name>{block_name}</name>'
+    yield f'<t>Unicode character range: U+{hex(char_range[0])[2:].upper().zfill(4)}..U+{hex(char_range[1])[2:].upper().zfill(4)}</t>'
+    yield f'<t><eref target="https://www.unicode.org/charts/PDF/U{hex(char_range[0])[2:].upper().zfill(4)}.pdf">Unicode {block_name} character list</eref></t>'
+    if stats is not None:
+        lookup_start = perf_counter()
+    spans = SCRIPT_TABLE.classify_range(char_range[0], char_range[1])
+    if stats is not None:
+        stats['script_lookup_seconds'] = perf_counter() - lookup_start
+        lookup_start = perf_counter()
+    block_fonts = dict.fromkeys(font for _, _, _, fonts in spans for font in fonts)
+    if stats is not None:
+        stats['font_lookup_seconds'] = perf_counter() - lookup_start
+    yield f'<t>xml2rfc fonts for this block: {", ".join(block_fonts) or "none"}</t>'
+    yield f'''
 <table>
   <name>{block_name} Characters</name>
   <thead>
@@ -137,68 +243,357 @@ def print_block(block_name, close=True):
       <th>xml2rfc fonts</th>
     </tr>
   </thead>
-<tbody>''')
-    for char_int in range(char_range[0], char_range[1])[:35]:
-        print('<tr>')
-        try:
-            xml = f'<u>&#x{hex(char_int)[2:].upper().zfill(4)};</u>'
-            etree.fromstring(xml)
-            char = chr(char_int)
-            scripts = which_scripts(char)
-            scripts_list = ', '.join(scripts)
-            fonts = ','.join(set([get_noto_serif_family_for_script(script) for script in scripts if script != 'Unknown']))
-            print(f'<td>{xml}</td>')
-            print(f'<td>{scripts_list}</td>')
-            print(f'<td>{fonts}</td>')
-        except etree.XMLSyntaxError:
-            print(f'<td>{hex(char_int)[2:].upper().zfill(4)} is not supported</td>')
-            print(f'<td></td>')
-            print(f'<td></td>')
-        print('</tr>')
-    print('</tbody>')
-    print('</table>')
-    if close:
-        print('</section>')
-
-
-print(DRAFT_HEAD)
-
-# Scripts section
-print('''
-<section>
-  <name>Scripts</name>
-  <t>This section covers Unicode scripts as defined in <xref target="charts" />.</t>''')
-for script_group, scripts in SCRIPTS_GROUPS.items():
-    print(f'<section><name>{escape(script_group)}</name>')
-    for script_dict in scripts:
-        for script, partial_scripts in script_dict.items():
-            if len(partial_scripts) == 0:
-                print_block(script)
+<tbody>'''
+    last_char = last_listed(char_range, limit)
+    if stats is not None:
+        stats['codepoints'], stats['invalid_xml'] = block_counts(block_name, limit)
+    for span_start, span_end, scripts, fonts in spans:
+        if span_start > last_char:
+            break
+        scripts_list = ', '.join(scripts)
+        fonts = ','.join(fonts)
+        for char_int in range(span_start, min(span_end, last_char) + 1):
+            if is_xml_char(char_int):
+                xml = f'<u>&#x{hex(char_int)[2:].upper().zfill(4)};</u>'
+                yield f'<tr>\n<td>{xml}</td>\n<td>{scripts_list}</td>\n<td>{fonts}</td>\n</tr>'
             else:
-                print_block(script, close=False)
+                yield f'<tr>\n<td>{hex(char_int)[2:].upper().zfill(4)} is not supported</td>\n<td></td>\n<td></td>\n</tr>'
+    yield '</tbody>'
+    yield '</table>'
+
+
+def render_block(block_name, limit=SAMPLE_SIZE):
+    """Returns the draft section fragment for block_name as one string."""
+    return '\n'.join(block_lines(block_name, limit))
+
+
+def render_block_stats(block_name, limit=SAMPLE_SIZE):
+    """Returns (fragment, stats) for block_name, see render_block() and BLOCK_STATS."""
+    stats = dict.fromkeys(BLOCK_STATS, 0)
+    stats['block'] = block_name
+    stats['cached'] = False
+    wall_start = perf_counter()
+    fragment = '\n'.join(block_lines(block_name, limit, stats))
+    stats['wall_seconds'] = perf_counter() - wall_start
+    stats['bytes'] = len(fragment.encode('utf-8')) + 1
+    return fragment, stats
+
+
+def cached_block_stats(block_name, limit, fragment):
+    """Returns BLOCK_STATS for a block whose fragment was not rendered again."""
+    stats = dict.fromkeys(BLOCK_STATS, 0)
+    stats['block'] = block_name
+    stats['cached'] = True
+    stats['codepoints'], stats['invalid_xml'] = block_counts(block_name, limit)
+    stats['bytes'] = len(fragment.encode('utf-8')) + 1
+    return stats
+
+
+def block_names(groups):
+    """Yields block names of groups in document order."""
+    for scripts in groups.values():
+        for script_dict in scripts:
+            for script, partial_scripts in script_dict.items():
+                yield script
+                yield from partial_scripts
+
+
+def write_groups(out, intro, groups, fragments):
+    """Writes groups, taking each block's lines from the fragments iterator."""
+    out.write(intro)
+    for script_group, scripts in groups.items():
+        out.write(f'<section><name>{escape(script_group)}</name>')
+        for script_dict in scripts:
+            for script, partial_scripts in script_dict.items():
+                out.writelines(next(fragments))
                 for partial_script in partial_scripts:
-                    print_block(partial_script)
-                print('</section>')
-    print('</section>')
-print('</section>')
+                    out.writelines(next(fragments))
+                    out.write('</section>')
+                out.write('</section>')
+        out.write('</section>')
+    out.write('</section>')
 
-# Symbols and Punctuation section
-print('''
-<section>
-  <name>Symbols and Punctuation</name>
-  <t>This section covers Unicode symbols and punctuation as defined in <xref target="charts" />.</t>''')
-for script_group, scripts in SYMBOLS_GROUPS.items():
-    print(f'<section><name>{escape(script_group)}</name>')
-    for script_dict in scripts:
-        for script, partial_scripts in script_dict.items():
-            if len(partial_scripts) == 0:
-                print_block(script)
+
+def font_manifest(names, limit=SAMPLE_SIZE):
+    """Returns the Noto font families needed by the characters listed for names.
+
+    Each family maps to the number of characters that need it, and to the
+    blocks and codepoint ranges of those characters.
+    """
+    manifest = {}
+    blocks = unicode_data().blocks
+    for block_name in dict.fromkeys(names):
+        if block_name not in blocks:
+            continue
+        char_range = blocks[block_name]
+        for span_start, span_end, _, fonts in SCRIPT_TABLE.classify_range(char_range[0], last_listed(char_range, limit)):
+            for start, end in xml_char_ranges(span_start, span_end):
+                for font in fonts:
+                    entry = manifest.setdefault(font, {'characters': 0, 'blocks': {}})
+                    entry['characters'] += end - start + 1
+                    ranges = entry['blocks'].setdefault(block_name, [])
+                    if ranges and ranges[-1][1] + 1 == start:
+                        ranges[-1][1] = end
+                    else:
+                        ranges.append([start, end])
+    return dict(sorted(manifest.items()))
+
+
+def write_font_manifest(path, limit=SAMPLE_SIZE):
+    names = [name for _, groups in draft_parts() for name in block_names(groups)]
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'xml2rfc': SCRIPT_TABLE.xml2rfc_version, 'fonts': font_manifest(names, limit)}, file, indent=2)
+        file.write('\n')
+
+
+def block_key(block_name, limit):
+    """Returns the fragment cache key for block_name."""
+    return FragmentCache.key(
+        block_name,
+        unicode_data().blocks.get(block_name),
+        limit,
+        SCRIPT_TABLE.xml2rfc_version,
+        SCRIPT_TABLE.uniscripts_digest,
+        TEMPLATE_DIGEST,
+    )
+
+
+def block_fragments(names, limit, executor=None, cache=None, stats=None, ahead=RENDER_AHEAD):
+    """Yields the lines of each block in names, in order.
+
+    Blocks found in cache are not rendered again.  Other blocks are rendered
+    by executor if given, at most ahead blocks past the one being yielded,
+    and stored in cache.  If stats is a list, a dict of BLOCK_STATS is
+    appended to it for each block; blocks not rendered again are reported as
+    cached.
+    """
+    render = render_block if stats is None else render_block_stats
+    keys = [block_key(name, limit) if cache else None for name in names]
+    # Futures are dropped after the last use of their block, so only the
+    # window of blocks being rendered is held in memory
+    last_use = {name: index for index, name in enumerate(names)}
+    futures = {}
+    submitted = 0
+    used = set()
+    for index, (name, key) in enumerate(zip(names, keys)):
+        if executor:
+            while submitted < min(len(names), index + ahead + 1):
+                next_name, next_key = names[submitted], keys[submitted]
+                if next_name not in futures and not (cache and next_key in cache):
+                    futures[next_name] = executor.submit(render, next_name, limit)
+                submitted += 1
+
+        fragment = cache.get(key) if cache else None
+        if fragment is None and name in futures and name in used:
+            # The future already rendered this block for an earlier repeat
+            result = futures[name].result()
+            fragment = result[0] if stats is not None else result
+        used.add(name)
+        if fragment is None:
+            if name in futures:
+                result = futures[name].result()
+            elif cache or stats is not None:
+                result = render(name, limit)
             else:
-                print_block(script, close=False)
-                for partial_script in partial_scripts:
-                    print_block(partial_script)
-                print('</section>')
-    print('</section>')
-print('</section>')
+                yield block_lines(name, limit)
+                continue
+            if stats is not None:
+                fragment, block_stats = result
+                stats.append(block_stats)
+            else:
+                fragment = result
+            if cache:
+                cache.put(key, fragment)
+        elif stats is not None:
+            stats.append(cached_block_stats(name, limit, fragment))
+        if last_use[name] == index:
+            futures.pop(name, None)
+        yield [fragment]
+
+
+def write_stats(path, stats):
+    """Writes per-block stats to path, as CSV if path ends in .csv and JSON otherwise."""
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        if path.endswith('.csv'):
+            writer = csv.DictWriter(file, fieldnames=BLOCK_STATS)
+            writer.writeheader()
+            writer.writerows(stats)
+        else:
+            json.dump(stats, file, indent=2)
+            file.write('\n')
+
+
+def write_document(file, parts, limit=SAMPLE_SIZE, executor=None, cache=None, doc_name=DOC_NAME, title=TITLE,
+                   stats=None, ahead=RENDER_AHEAD):
+    """Writes a draft made of parts, a list of (intro, groups), to file.
+
+    See block_fragments() for executor, cache, stats and ahead.
+    """
+    out = DraftWriter(file)
+    out.write(DRAFT_HEAD.format(doc_name=doc_name, title=escape(title)))
+    names = [name for _, groups in parts for name in block_names(groups)]
+    fragments = block_fragments(names, limit, executor, cache, stats, ahead)
+    for intro, groups in parts:
+        write_groups(out, intro, groups, fragments)
+    out.write(DRAFT_TAIL)
+    out.flush()
+
+
+def draft_parts():
+    return [(SCRIPTS_INTRO, unicode_data().scripts_groups), (SYMBOLS_INTRO, unicode_data().symbols_groups)]
+
+
+def write_draft(file, limit=SAMPLE_SIZE, jobs=1, cache=None, stats=None):
+    """Writes the draft to file, rendering blocks in jobs worker processes."""
+    with ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext() as executor:
+        write_document(file, draft_parts(), limit, executor, cache, stats=stats, ahead=RENDER_AHEAD * jobs)
+    if cache:
+        cache.evict()
+
+
+def shard_doc_name(group):
+    """Returns the draft name of the shard for a top-level group."""
+    slug = re.sub(r'[^a-z0-9]+', '-', group.lower()).strip('-')
+    base, version = DOC_NAME.rsplit('-', 1)
+    return f'{base}-{slug}-{version}'
+
+
+def write_shards(directory, limit=SAMPLE_SIZE, jobs=1, cache=None, stats=None):
+    """Writes one self-contained draft per top-level group to directory.
+
+    Returns (group, draft name) for each shard.
+    """
+    os.makedirs(directory, exist_ok=True)
+    shards = []
+    with ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext() as executor:
+        for intro, groups in draft_parts():
+            for group, scripts in groups.items():
+                doc_name = shard_doc_name(group)
+                with open(os.path.join(directory, f'{doc_name}.xml'), 'w', encoding='utf-8') as file:
+                    write_document(file, [(intro, {group: scripts})], limit, executor, cache,
+                                   doc_name, f'{TITLE}: {group}', stats, RENDER_AHEAD * jobs)
+                shards.append((group, doc_name))
+    if cache:
+        cache.evict()
+    return shards
+
+
+def run_xml2rfc(command):
+    """Runs an xml2rfc command, returns its error output if it failed, else None."""
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    except FileNotFoundError as e:
+        return f'{e}\n'
+    return result.stderr if result.returncode != 0 else None
+
+
+def render_shards(directory, doc_names, formats, jobs=1):
+    """Renders the shard drafts in directory with xml2rfc, jobs at a time.
+
+    Each draft and format is rendered by its own xml2rfc process.  Returns the
+    number of failed renders.
+    """
+    commands = [
+        ['xml2rfc', f'--{render_format}', '--quiet',
+         '--out', os.path.join(directory, f'{doc_name}.{RENDER_FORMATS[render_format]}'),
+         os.path.join(directory, f'{doc_name}.xml')]
+        for doc_name in doc_names
+        for render_format in formats
+    ]
+    failures = 0
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for command, error in zip(commands, executor.map(run_xml2rfc, commands)):
+            if error is not None:
+                failures += 1
+                print(f'{" ".join(command)} failed:\n{error}', file=sys.stderr)
+    return failures
+
+
+def write_shard_index(directory, shards, formats):
+    """Writes index.html linking every shard and its rendered formats."""
+    with open(os.path.join(directory, 'index.html'), 'w', encoding='utf-8') as file:
+        out = DraftWriter(file)
+        out.write('<!DOCTYPE html>')
+        out.write(f'<html><head><meta charset="utf-8"><title>{escape(TITLE)}</title></head><body>')
+        out.write(f'<h1>{escape(TITLE)}</h1>')
+        out.write('<ul>')
+        for group, doc_name in shards:
+            links = [f'<a href="{doc_name}.xml">xml</a>']
+            links += [f'<a href="{doc_name}.{RENDER_FORMATS[render_format]}">{render_format}</a>'
+                      for render_format in formats]
+            out.write(f'<li>{escape(group)}: {", ".join(links)}</li>')
+        out.write('</ul>')
+        out.write('</body></html>')
+        out.flush()
+
+
+SCRIPT_TABLE = script_table.load()
+TEMPLATE_DIGEST = hashlib.sha256((inspect.getsource(block_lines) + repr(XML_CHAR_RANGES)).encode('utf-8')).hexdigest()
+
+
+def positive_int(value):
+    """argparse type for integers of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'{value} is not a positive integer')
+    return number
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate the xml2rfc Unicode experiment draft.')
+    parser.add_argument('--output', help='draft XML file (default: stdout)')
+    parser.add_argument('--full', action='store_true', help='list every character of each block')
+    parser.add_argument('--limit', type=positive_int, default=SAMPLE_SIZE,
+                        help=f'characters listed per block (default: {SAMPLE_SIZE})')
+    parser.add_argument('--jobs', type=positive_int, default=1,
+                        help='worker processes used to render blocks (default: 1)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help=f'rendered block cache directory (default: {CACHE_DIR})')
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help='rendered block cache size cap in MiB (default: 256)')
+    parser.add_argument('--no-cache', action='store_true', help='render every block again')
+    parser.add_argument('--font-manifest', metavar='PATH',
+                        help='also write the fonts needed by the draft as JSON to PATH')
+    parser.add_argument('--shard-dir', metavar='DIR',
+                        help='write one draft per top-level group to DIR and render them with xml2rfc')
+    parser.add_argument('--formats', default=','.join(RENDER_FORMATS),
+                        help=f'xml2rfc formats rendered for shards (default: {",".join(RENDER_FORMATS)})')
+    parser.add_argument('--stats', metavar='PATH',
+                        help='write per-block counts and timings to PATH, as CSV if it ends in .csv, else JSON')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='profile generation with cProfile and dump pstats data to PATH')
+    args = parser.parse_args()
+
+    limit = None if args.full else args.limit
+    cache = None if args.no_cache else FragmentCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    formats = [render_format for render_format in args.formats.split(',') if render_format]
+    unknown = set(formats) - set(RENDER_FORMATS)
+    if unknown:
+        parser.error(f'unknown formats: {", ".join(sorted(unknown))}')
+    if args.shard_dir and args.output:
+        parser.error('--output cannot be used with --shard-dir')
+
+    stats = [] if args.stats else None
+    profile = cProfile.Profile() if args.profile else None
+    if profile:
+        profile.enable()
+
+    failures = 0
+    if args.shard_dir:
+        shards = write_shards(args.shard_dir, limit, args.jobs, cache, stats)
+        failures = render_shards(args.shard_dir, [doc_name for _, doc_name in shards], formats, args.jobs)
+        write_shard_index(args.shard_dir, shards, formats)
+    elif args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            write_draft(file, limit, args.jobs, cache, stats)
+    else:
+        write_draft(sys.stdout, limit, args.jobs, cache, stats)
 
-print(DRAFT_TAIL)
+    if profile:
+        profile.disable()
+        profile.dump_stats(args.profile)
+    if args.stats:
+        write_stats(args.stats, stats)
+    if args.font_manifest:
+        write_font_manifest(args.font_manifest, limit)
+    sys.exit(1 if failures else 0)
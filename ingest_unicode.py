@@ -0,0 +1,261 @@
+"""Builds unicode_data.json from local copies of Unicode data files.
+
+Inputs:
+    Blocks.txt   https://www.unicode.org/Public/<version>/ucd/Blocks.txt
+    Scripts.txt  https://www.unicode.org/Public/<version>/ucd/Scripts.txt
+    index.html   https://www.unicode.org/charts/index.html
+
+Usage:
+    python ingest_unicode.py --blocks Blocks.txt --scripts Scripts.txt --charts index.html
+
+Check the ingestion against the files in fixtures/:
+    python ingest_unicode.py --check
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'unicode_data.json')
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+FORMAT_VERSION = 1
+
+FIXES = {
+    'Latin': 'Basic Latin',
+    'Greek': 'Greek and Coptic',
+    'CJK Unified Ideographs (Han) (35MB)': 'CJK Unified Ideographs',
+    'CJK  Extension A (6MB)': 'CJK Unified Ideographs Extension A',
+    'CJK Extension B (40MB)': 'CJK Unified Ideographs Extension B',
+    'CJK Extension C (3MB)': 'CJK Unified Ideographs Extension C',
+    'CJK Extension D': 'CJK Unified Ideographs Extension D',
+    'CJK Extension E (3.5MB)': 'CJK Unified Ideographs Extension E',
+    'CJK Extension F (4MB)': 'CJK Unified Ideographs Extension F',
+    'CJK Extension G (2MB)': 'CJK Unified Ideographs Extension G',
+    'CJK Extension H (2.5MB)': 'CJK Unified Ideographs Extension H',
+    "N'Ko": 'NKo',
+    'CJK Radicals / Kangxi Radicals': 'Kangxi Radicals',
+    'Oriya (Odia)': 'Oriya',
+    'Bengali and Assamese': 'Bengali',
+    'Phags-Pa': 'Phags-pa',
+    'Aramaic, Imperial': 'Imperial Aramaic',
+    'Pahlavi, Inscriptional': 'Inscriptional Pahlavi',
+    'Pahlavi, Psalter': 'Psalter Pahlavi',
+    'Parthian, Inscriptional': 'Inscriptional Parthian',
+    'Optical Character Recognition (OCR)': 'Optical Character Recognition',
+    'Super and Subscripts': 'Superscripts and Subscripts',
+    'Miscellaneous Symbols And Pictographs': 'Miscellaneous Symbols and Pictographs',
+}
+
+IGNORE = [
+    'Armenian Ligatures',
+    'Basic Latin (ASCII)',
+    'Coptic in Greek block',
+    '(see also Unihan Database)',
+    'ASCII Punctuation',
+    'Latin-1 Punctuation',
+    'Roman Symbols',
+    'Additional Squared Symbols',
+    'ASCII Digits',
+    'Fullwidth ASCII Digits',
+    'Basic operators: Plus, Factorial, Division, Multiplication',
+    'Additional Shapes',
+    '(see also specific scripts)',
+    'Dollar Sign, Euro Sign',
+    'Yen, Pound and Cent',
+    'Fullwidth Currency Symbols',
+    'Rial Sign',
+    'Chess, Checkers/Draughts',
+    'Yijing Mono-, Di- and Trigrams',
+]
+
+
+def ucd_version(path):
+    """Returns the Unicode version from the header line of a UCD file."""
+    with open(path, 'r', encoding='utf-8') as file:
+        match = re.match(r'# \w+-(\d+\.\d+\.\d+)\.txt', file.readline())
+    return match.group(1) if match else None
+
+
+def parse_ucd_file(path):
+    """Yields (start, end, value) for each data line of a UCD range file."""
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.split('#', 1)[0].strip()
+            if line == '':
+                continue
+            fields = line.split(';')
+            char_range = fields[0].strip().split('..')
+            yield int(char_range[0], 16), int(char_range[-1], 16), fields[1].strip()
+
+
+def parse_blocks(path):
+    """Returns blocks parsed from Blocks.txt."""
+    return {block_name: (start, end) for start, end, block_name in parse_ucd_file(path)}
+
+
+def parse_scripts(path):
+    """Returns sorted, merged (start, end, script) ranges parsed from Scripts.txt."""
+    scripts = []
+    for start, end, script in sorted(parse_ucd_file(path)):
+        if scripts and scripts[-1][2] == script and scripts[-1][1] + 1 == start:
+            scripts[-1] = (scripts[-1][0], end, script)
+        else:
+            scripts.append((start, end, script))
+    return scripts
+
+
+def parse_block_groups(table):
+    """Returns the chart groups of a charts index table, with FIXES and IGNORE applied."""
+    block_list = {}
+    sg = None
+    mb = None
+    sg_list = []
+    mb_list = []
+    for p in table.find_all('p'):
+        value = p.text.strip().replace('\xa0', ' ')
+        if value in IGNORE:
+            continue
+        if value in FIXES.keys():
+            value = FIXES[value]
+
+        if p['class'][0] == 'sg':
+            if sg:
+                if mb:
+                    sg_list.append({mb: mb_list})
+                block_list[sg] = sg_list
+            sg_list = []
+            mb_list = []
+            sg = value
+            mb = None
+        elif p['class'][0] == 'mb':
+            if mb:
+                sg_list.append({mb: mb_list})
+            mb = value
+            mb_list = []
+        elif p['class'][0] == 'pb':
+            mb_list.append(value)
+        elif p['class'][0] == 'sb':
+            if mb:
+                sg_list.append({mb: mb_list})
+            mb_list = []
+            mb = None
+            sg_list.append({value: []})
+
+    # The last group has no following sg row to save it
+    if sg:
+        if mb:
+            sg_list.append({mb: mb_list})
+        block_list[sg] = sg_list
+
+    return block_list
+
+
+def parse_charts(path):
+    """Returns (scripts_groups, symbols_groups) parsed from the charts index."""
+    # Only needed when ingesting, keep it out of generate-draft.py startup
+    from bs4 import BeautifulSoup
+
+    with open(path, 'rb') as file:
+        soup = BeautifulSoup(file, 'html.parser')
+    scripts_table = soup.find('table', {'id': 'table5'})
+    symbols_table = soup.find('table', {'id': 'table9'})
+    return parse_block_groups(scripts_table), parse_block_groups(symbols_table)
+
+
+def ingest(blocks_path, scripts_path, charts_path=None, groups_path=None):
+    """Returns the unicode data parsed from the given files.
+
+    The chart groups are parsed from charts_path, or copied from the unicode
+    data file groups_path.
+    """
+    if charts_path:
+        scripts_groups, symbols_groups = parse_charts(charts_path)
+    else:
+        groups = UnicodeData(groups_path)
+        scripts_groups, symbols_groups = groups.scripts_groups, groups.symbols_groups
+    return {
+        'format': FORMAT_VERSION,
+        'unicode': ucd_version(blocks_path),
+        'blocks': parse_blocks(blocks_path),
+        'scripts': parse_scripts(scripts_path),
+        'scripts_groups': scripts_groups,
+        'symbols_groups': symbols_groups,
+    }
+
+
+def save(data, path=DATA_FILE):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, separators=(',', ':'))
+        file.write('\n')
+
+
+class UnicodeData:
+    """Unicode data loaded from a file written by ingest_unicode.py."""
+
+    def __init__(self, path=DATA_FILE):
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        if data['format'] != FORMAT_VERSION:
+            raise ValueError(f'{path} has unsupported format {data["format"]}')
+        self.unicode_version = data['unicode']
+        self.blocks = {name: tuple(char_range) for name, char_range in data['blocks'].items()}
+        self.scripts = [tuple(script_range) for script_range in data['scripts']]
+        self.scripts_groups = data['scripts_groups']
+        self.symbols_groups = data['symbols_groups']
+
+
+def check(fixtures_dir=FIXTURES_DIR):
+    """Returns messages for differences between the ingested fixtures and the expected data."""
+    expected = {
+        'format': FORMAT_VERSION,
+        'unicode': '16.0.0',
+        'blocks': {
+            'Basic Latin': (0x0000, 0x007F),
+            'Latin-1 Supplement': (0x0080, 0x00FF),
+            'Greek and Coptic': (0x0370, 0x03FF),
+            'General Punctuation': (0x2000, 0x206F),
+        },
+        'scripts': [
+            (0x0000, 0x0023, 'Common'),
+            (0x0041, 0x005A, 'Latin'),
+            (0x0061, 0x007A, 'Latin'),
+            (0x0370, 0x0373, 'Greek'),
+        ],
+        'scripts_groups': {
+            'European Scripts': [{'Basic Latin': ['Latin-1 Supplement']}, {'Greek and Coptic': []}],
+            'Notational Systems': [{'Braille Patterns': []}, {'Musical Symbols': ['Ancient Greek Musical Notation']}],
+        },
+        'symbols_groups': {
+            'Punctuation': [{'General Punctuation': []}],
+        },
+    }
+    data = ingest(os.path.join(fixtures_dir, 'Blocks.txt'),
+                  os.path.join(fixtures_dir, 'Scripts.txt'),
+                  os.path.join(fixtures_dir, 'index.html'))
+    return [f'{key}: expected {value!r}, got {data[key]!r}'
+            for key, value in expected.items() if data[key] != value]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build unicode_data.json from Unicode data files.')
+    parser.add_argument('--blocks', default='Blocks.txt', help='Blocks.txt from the UCD')
+    parser.add_argument('--scripts', default='Scripts.txt', help='Scripts.txt from the UCD')
+    groups = parser.add_mutually_exclusive_group()
+    groups.add_argument('--charts', default='index.html', help='Unicode charts index page')
+    groups.add_argument('--groups-from', metavar='PATH',
+                        help='copy the chart groups from an existing unicode data file instead')
+    parser.add_argument('--output', default=DATA_FILE, help='data file')
+    parser.add_argument('--check', action='store_true', help='check the ingestion against the fixtures')
+    args = parser.parse_args()
+
+    if args.check:
+        problems = check()
+        for problem in problems:
+            print(problem)
+        sys.exit(1 if problems else 0)
+    elif args.groups_from:
+        save(ingest(args.blocks, args.scripts, groups_path=args.groups_from), args.output)
+    else:
+        save(ingest(args.blocks, args.scripts, args.charts), args.output)
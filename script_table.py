@@ -0,0 +1,210 @@
+"""Precomputed codepoint to xml2rfc script and font lookup table.
+
+The table is built once from xml2rfc's uniscripts data and saved to a binary
+file.  The file holds a JSON header followed by an array with one unsigned
+16-bit script-set id per codepoint.  Each script-set id maps to the list of
+scripts returned by which_scripts() and the Noto font families for them.
+The header also lists the runs of codepoints sharing a script-set id, so a
+range can be classified span by span instead of codepoint by codepoint.
+
+Build (or rebuild) the table:
+    python script_table.py
+
+Verify the table against which_scripts() for every codepoint:
+    python script_table.py --check
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from functools import cache
+
+import xml2rfc
+from xml2rfc.uniscripts import RANGES, which_scripts
+from xml2rfc.util.fonts import get_noto_serif_family_for_script
+
+
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'script_table.bin')
+MAGIC = b'XSTB'
+FORMAT_VERSION = 3
+MAX_CODEPOINT = 0x10FFFF
+
+
+@cache
+def font_for_script(script):
+    """Returns the Noto font family xml2rfc uses for script."""
+    return get_noto_serif_family_for_script(script)
+
+
+def fonts_for_scripts(scripts):
+    """Returns Noto font families for scripts, in script order."""
+    fonts = [font_for_script(script) for script in scripts if script != 'Unknown']
+    return list(dict.fromkeys(fonts))
+
+
+def build():
+    """Returns (header, ids) built from uniscripts ranges."""
+    per_codepoint = {}
+    for script, ranges in RANGES.items():
+        for script_range in ranges:
+            for char_int in script_range:
+                scripts = per_codepoint.setdefault(char_int, [])
+                # Ranges of a script may overlap, which_scripts lists it once
+                if not scripts or scripts[-1] != script:
+                    scripts.append(script)
+
+    script_sets = [('Unknown',)]
+    set_ids = {('Unknown',): 0}
+    ids = array('H', bytes(2 * (MAX_CODEPOINT + 1)))
+    for char_int, scripts in per_codepoint.items():
+        scripts = tuple(scripts)
+        if scripts not in set_ids:
+            set_ids[scripts] = len(script_sets)
+            script_sets.append(scripts)
+        ids[char_int] = set_ids[scripts]
+
+    # Script sets only change at range boundaries, walk them in order and
+    # merge neighbouring runs with the same script set
+    boundaries = {0}
+    for ranges in RANGES.values():
+        for script_range in ranges:
+            boundaries.add(script_range.start)
+            boundaries.add(script_range.stop)
+    runs = []
+    for boundary in sorted(boundaries):
+        if boundary > MAX_CODEPOINT:
+            break
+        if not runs or runs[-1][1] != ids[boundary]:
+            runs.append([boundary, ids[boundary]])
+
+    header = {
+        'format': FORMAT_VERSION,
+        'xml2rfc': xml2rfc.__version__,
+        'uniscripts': hashlib.sha256(repr(RANGES).encode('utf-8')).hexdigest(),
+        'scripts': [list(scripts) for scripts in script_sets],
+        'fonts': [fonts_for_scripts(scripts) for scripts in script_sets],
+        'runs': runs,
+    }
+    return header, ids
+
+
+def save(path=TABLE_FILE):
+    """Builds the table and writes it to path."""
+    header, ids = build()
+    data = json.dumps(header).encode('utf-8')
+    # Keep the id array 2-byte aligned for memoryview casts
+    data += b' ' * (len(data) % 2)
+    # Replace rather than overwrite, the old table may still be mapped
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(MAGIC)
+        file.write(struct.pack('<I', len(data)))
+        file.write(data)
+        if sys.byteorder != 'little':
+            ids.byteswap()
+        file.write(ids.tobytes())
+    os.replace(tmp_path, path)
+
+
+class ScriptTable:
+    """Memory-mapped codepoint to script-set lookup table."""
+
+    def __init__(self, path=TABLE_FILE):
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:4] != MAGIC:
+            raise ValueError(f'{path} is not a script table')
+        header_size = struct.unpack('<I', self._mmap[4:8])[0]
+        header = json.loads(self._mmap[8:8 + header_size])
+        if header['format'] != FORMAT_VERSION:
+            raise ValueError(f'{path} has unsupported format {header["format"]}')
+        self.xml2rfc_version = header['xml2rfc']
+        self.uniscripts_digest = header['uniscripts']
+        self.scripts = [tuple(scripts) for scripts in header['scripts']]
+        self.fonts = [tuple(fonts) for fonts in header['fonts']]
+        self.run_starts = [start for start, _ in header['runs']]
+        self.run_ids = [set_id for _, set_id in header['runs']]
+        ids = memoryview(self._mmap)[8 + header_size:]
+        if sys.byteorder != 'little':
+            # The file is little-endian, swap a copy instead of the mapping
+            swapped = array('H')
+            swapped.frombytes(ids)
+            swapped.byteswap()
+            self.ids = memoryview(swapped)
+        else:
+            self.ids = ids.cast('H')
+
+    def lookup(self, start, end):
+        """Returns script-set ids for codepoints start..end (inclusive)."""
+        return self.ids[start:end + 1]
+
+    def classify_range(self, start, end):
+        """Returns (start, end, scripts, fonts) spans covering start..end (inclusive).
+
+        Neighbouring spans always differ in scripts.
+        """
+        if not 0 <= start <= end <= MAX_CODEPOINT:
+            raise ValueError(f'invalid codepoint range {start:#x}..{end:#x}')
+        spans = []
+        index = bisect_right(self.run_starts, start) - 1
+        while index < len(self.run_starts) and self.run_starts[index] <= end:
+            if index + 1 < len(self.run_starts):
+                run_end = self.run_starts[index + 1] - 1
+            else:
+                run_end = MAX_CODEPOINT
+            set_id = self.run_ids[index]
+            spans.append((max(start, self.run_starts[index]), min(end, run_end),
+                          self.scripts[set_id], self.fonts[set_id]))
+            index += 1
+        return spans
+
+
+def load(path=TABLE_FILE):
+    """Returns the script table at path, rebuilding it if missing or stale."""
+    try:
+        table = ScriptTable(path)
+        if table.xml2rfc_version == xml2rfc.__version__:
+            return table
+    except (OSError, ValueError, KeyError):
+        pass
+    save(path)
+    return ScriptTable(path)
+
+
+def check(table, start=0, end=MAX_CODEPOINT):
+    """Returns codepoints in start..end where table and which_scripts differ.
+
+    Codepoints whose classify_range() span disagrees with the table are
+    reported too.
+    """
+    mismatches = []
+    for span_start, span_end, scripts, fonts in table.classify_range(start, end):
+        for char_int, set_id in enumerate(table.lookup(span_start, span_end), span_start):
+            if table.scripts[set_id] != scripts or table.fonts[set_id] != fonts:
+                mismatches.append(char_int)
+    for char_int, set_id in enumerate(table.lookup(start, end), start):
+        scripts = which_scripts(chr(char_int))
+        if tuple(scripts) != table.scripts[set_id] \
+                or tuple(fonts_for_scripts(scripts)) != table.fonts[set_id]:
+            mismatches.append(char_int)
+    return mismatches
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the xml2rfc script lookup table.')
+    parser.add_argument('--output', default=TABLE_FILE, help='table file')
+    parser.add_argument('--check', action='store_true', help='verify the table against which_scripts()')
+    args = parser.parse_args()
+
+    if args.check:
+        mismatches = check(load(args.output))
+        for char_int in mismatches:
+            print(f'U+{char_int:04X} does not match which_scripts()')
+        sys.exit(1 if mismatches else 0)
+    else:
+        save(args.output)
@@ -0,0 +1,61 @@
+"""XML 1.0 legal character lookup.
+
+Answers whether a codepoint matches the XML 1.0 Char production, and so can
+be written as a character reference, without invoking an XML parser.
+
+Check the table against lxml for every codepoint:
+    python xml_chars.py
+"""
+import sys
+from bisect import bisect_right
+
+from lxml import etree
+
+
+MAX_CODEPOINT = 0x10FFFF
+
+# Char ::= #x9 | #xA | #xD | [#x20-#xD7FF] | [#xE000-#xFFFD] | [#x10000-#x10FFFF]
+# https://www.w3.org/TR/xml/#charsets
+XML_CHAR_RANGES = [
+    (0x9, 0xA),
+    (0xD, 0xD),
+    (0x20, 0xD7FF),
+    (0xE000, 0xFFFD),
+    (0x10000, MAX_CODEPOINT),
+]
+
+_STARTS = [start for start, _ in XML_CHAR_RANGES]
+
+
+def is_xml_char(char_int):
+    """Returns true if codepoint char_int is a legal XML 1.0 character."""
+    index = bisect_right(_STARTS, char_int) - 1
+    return index >= 0 and char_int <= XML_CHAR_RANGES[index][1]
+
+
+def xml_char_ranges(start, end):
+    """Returns the (start, end) parts of start..end that are legal XML 1.0 characters."""
+    return [(max(start, range_start), min(end, range_end))
+            for range_start, range_end in XML_CHAR_RANGES
+            if range_start <= end and range_end >= start]
+
+
+def check(start=0, end=MAX_CODEPOINT):
+    """Returns codepoints in start..end where is_xml_char and lxml differ."""
+    mismatches = []
+    for char_int in range(start, end + 1):
+        try:
+            etree.fromstring(f'<u>&#x{char_int:04X};</u>')
+            legal = True
+        except etree.XMLSyntaxError:
+            legal = False
+        if legal != is_xml_char(char_int):
+            mismatches.append(char_int)
+    return mismatches
+
+
+if __name__ == '__main__':
+    mismatches = check()
+    for char_int in mismatches:
+        print(f'U+{char_int:04X} does not match lxml')
+    sys.exit(1 if mismatches else 0)